@@ -0,0 +1,46 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+User = get_user_model()
+
+CACHED_USER_FIELDS = [
+    field.attname for field in User._meta.concrete_fields
+    if field.name != 'password'
+]
+
+
+def get_token_cache_key(key):
+    return 'auth-token:{}'.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+def invalidate_tokens(keys):
+    cache_keys = [get_token_cache_key(key) for key in keys]
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache_key = get_token_cache_key(key)
+        values = cache.get(cache_key)
+        if values is None:
+            values = self.get_model().objects.filter(key=key).values_list(
+                *[f'user__{name}' for name in CACHED_USER_FIELDS]
+            ).first()
+            if values is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cache.set(cache_key, values, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        user = User.from_db(
+            router.db_for_read(User), CACHED_USER_FIELDS, values
+        )
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+        return user, self.get_model()(key=key, user=user)
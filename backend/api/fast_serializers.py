@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from django.core.files.storage import default_storage
+
+from recipes.models import IngredientInRecipe, Recipe
+
+RECIPE_VALUES = (
+    'id',
+    'name',
+    'image',
+    'text',
+    'cooking_time',
+    'created_at',
+    'is_favorited',
+    'is_in_shopping_cart',
+    'author_is_subscribed',
+    'author__id',
+    'author__email',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'author__avatar',
+)
+
+
+class FastRecipeSerializer:
+    def __init__(self, request):
+        self.request = request
+
+    @staticmethod
+    def get_values(queryset):
+        return queryset.prefetch_related(None).values(*RECIPE_VALUES)
+
+    def get_file_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        if self.request is not None:
+            return self.request.build_absolute_uri(url)
+        return url
+
+    def get_tags(self, recipe_ids):
+        tags = defaultdict(list)
+        for recipe_id, tag_id, name, slug in (
+            Recipe.tags.through.objects
+            .filter(recipe_id__in=recipe_ids)
+            .values_list('recipe_id', 'tag__id', 'tag__name', 'tag__slug')
+            .order_by('tag__id')
+        ):
+            tags[recipe_id].append({'id': tag_id, 'name': name, 'slug': slug})
+        return tags
+
+    def get_ingredients(self, recipe_ids):
+        ingredients = defaultdict(list)
+        for recipe_id, ingredient_id, name, unit, amount in (
+            IngredientInRecipe.objects
+            .filter(recipe_id__in=recipe_ids)
+            .values_list(
+                'recipe_id',
+                'ingredient__id',
+                'ingredient__name',
+                'ingredient__measurement_unit',
+                'amount',
+            )
+            .order_by('id')
+        ):
+            ingredients[recipe_id].append({
+                'id': ingredient_id,
+                'name': name,
+                'measurement_unit': unit,
+                'amount': amount,
+            })
+        return ingredients
+
+    def serialize(self, rows):
+        recipe_ids = [row['id'] for row in rows]
+        tags = self.get_tags(recipe_ids)
+        ingredients = self.get_ingredients(recipe_ids)
+        return [
+            {
+                'id': row['id'],
+                'tags': tags[row['id']],
+                'author': {
+                    'id': row['author__id'],
+                    'email': row['author__email'],
+                    'username': row['author__username'],
+                    'first_name': row['author__first_name'],
+                    'last_name': row['author__last_name'],
+                    'is_subscribed': row['author_is_subscribed'],
+                    'avatar': self.get_file_url(row['author__avatar']),
+                },
+                'ingredients': ingredients[row['id']],
+                'is_favorited': row['is_favorited'],
+                'is_in_shopping_cart': row['is_in_shopping_cart'],
+                'name': row['name'],
+                'image': self.get_file_url(row['image']),
+                'text': row['text'],
+                'cooking_time': row['cooking_time'],
+            }
+            for row in rows
+        ]
@@ -1,16 +1,90 @@
+from django import forms
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+)
+from django.db import connections
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    When,
+)
+from django.db.models.functions import Length
 from django_filters.rest_framework import FilterSet, filters
+from rest_framework.exceptions import ValidationError
 
-from recipes.models import Ingredient, Recipe, Tag
+from recipes.models import Ingredient, IngredientInRecipe, Recipe, Tag
+
+
+def filter_by_similarity(queryset, field_name, value):
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.filter(
+            **{f'{field_name}__icontains': value}
+        ).order_by(Length(field_name), field_name)
+    return queryset.filter(
+        **{f'{field_name}__trigram_similar': value}
+    ).annotate(
+        similarity=TrigramSimilarity(field_name, value)
+    ).order_by('-similarity', field_name)
+
+
+def filter_by_ingredients(queryset, ingredient_ids, min_matches):
+    matches = IngredientInRecipe.objects.filter(
+        ingredient_id__in=ingredient_ids
+    ).values('recipe').annotate(matched=Count('ingredient', distinct=True))
+    coverage = matches.filter(recipe=OuterRef('pk')).values('matched')
+    return queryset.filter(
+        id__in=matches.filter(matched__gte=min_matches).values('recipe')
+    ).annotate(
+        coverage=Subquery(coverage)
+    ).order_by('-coverage', '-created_at')
+
+
+def filter_by_full_text(queryset, value):
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.filter(
+            Q(name__icontains=value) | Q(text__icontains=value)
+        )
+    query = SearchQuery(
+        value, config=settings.SEARCH_CONFIG, search_type='websearch'
+    )
+    return queryset.filter(
+        search_vector=query
+    ).annotate(
+        rank=SearchRank(F('search_vector'), query)
+    ).order_by('-rank', '-created_at')
+
+
+class IntegerFilter(filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class IntegerInFilter(filters.BaseInFilter, IntegerFilter):
+    pass
 
 
 class IngredientFilter(FilterSet):
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='istartswith')
+    search = filters.CharFilter(
+        method='filter_search',
+        label='Search',
+    )
 
     class Meta:
         model = Ingredient
-        fields = ('name',)
+        fields = ('name', 'search')
+
+    def filter_search(self, queryset, name, value):
+        return filter_by_similarity(queryset, 'name', value)
 
 
 class RecipeFilter(FilterSet):
@@ -33,10 +107,40 @@ class RecipeFilter(FilterSet):
         method='filter_is_in_shopping_cart',
         label='Is in Shopping Cart',
     )
+    search = filters.CharFilter(
+        method='filter_search',
+        label='Search',
+    )
+    q = filters.CharFilter(
+        method='filter_full_text',
+        label='Full-text query',
+    )
+    ingredients = IntegerInFilter(
+        method='filter_ingredients',
+        label='Ingredient IDs',
+    )
+    min_ingredients = IntegerFilter(
+        method='filter_min_ingredients',
+        label='Minimum matched ingredients',
+    )
+    ids = IntegerInFilter(
+        method='filter_ids',
+        label='Recipe IDs',
+    )
 
     class Meta:
         model = Recipe
-        fields = ('tags', 'author', 'is_favorited', 'is_in_shopping_cart')
+        fields = (
+            'tags',
+            'author',
+            'is_favorited',
+            'is_in_shopping_cart',
+            'search',
+            'q',
+            'ingredients',
+            'min_ingredients',
+            'ids',
+        )
 
     def filter_is_favorited(self, queryset, name, value):
         if self.request.user.is_authenticated and value:
@@ -47,3 +151,36 @@ class RecipeFilter(FilterSet):
         if self.request.user.is_authenticated and value:
             return queryset.filter(cartitem_items__user=self.request.user)
         return queryset
+
+    def filter_search(self, queryset, name, value):
+        return filter_by_similarity(queryset, 'name', value)
+
+    def filter_full_text(self, queryset, name, value):
+        return filter_by_full_text(queryset, value)
+
+    def filter_ingredients(self, queryset, name, value):
+        ingredient_ids = set(value)
+        min_matches = self.form.cleaned_data.get('min_ingredients')
+        if not min_matches:
+            min_matches = len(ingredient_ids)
+        return filter_by_ingredients(
+            queryset, ingredient_ids, min(min_matches, len(ingredient_ids))
+        )
+
+    def filter_min_ingredients(self, queryset, name, value):
+        return queryset
+
+    def filter_ids(self, queryset, name, value):
+        if len(value) > settings.BULK_RECIPES_LIMIT:
+            raise ValidationError({
+                'ids': f'Можно запросить не больше '
+                       f'{settings.BULK_RECIPES_LIMIT} рецептов.'
+            })
+        recipe_ids = list(dict.fromkeys(value))
+        return queryset.filter(id__in=recipe_ids).order_by(Case(
+            *[
+                When(id=recipe_id, then=position)
+                for position, recipe_id in enumerate(recipe_ids)
+            ],
+            output_field=IntegerField()
+        ))
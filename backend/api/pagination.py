@@ -1,7 +1,135 @@
+import hashlib
+
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class CountedPaginator(Paginator):
+    def __init__(self, object_list, per_page, counter, exact_counter=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter
+        self.exact_counter = exact_counter
+
+    @cached_property
+    def count(self):
+        return self.counter(self.object_list)
+
+    def set_count(self, count):
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+
+    def set_exact_count(self):
+        self.set_count(self.exact_counter(self.object_list))
+        self.exact_counter = None
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.exact_counter is None:
+                raise
+            self.set_exact_count()
+            return super().validate_number(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.exact_counter is None:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        object_list = list(self.object_list[bottom:top + 1])
+        if not object_list and number > 1:
+            self.set_exact_count()
+            return super().page(number)
+        if len(object_list) <= self.per_page:
+            self.set_count(bottom + len(object_list))
+        elif self.count <= top:
+            self.set_count(top + 1)
+        return self._get_page(object_list[:self.per_page], number, self)
 
 
 class CustomLimitPagination(PageNumberPagination):
     page_size_query_param = 'limit'
     page_size = settings.PAGE_SIZE
+
+
+class FastCountPagination(CustomLimitPagination):
+    count_strategy = settings.PAGINATION_COUNT_STRATEGY
+    count_threshold = settings.PAGINATION_COUNT_THRESHOLD
+    count_cache_timeout = settings.PAGINATION_COUNT_CACHE_TIMEOUT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset, page_size):
+        exact_counter = None
+        if self.count_strategy != 'exact':
+            exact_counter = self.get_exact_count
+        return CountedPaginator(
+            queryset,
+            page_size,
+            getattr(self, f'get_{self.count_strategy}_count'),
+            exact_counter
+        )
+
+    def get_exact_count(self, queryset):
+        return queryset.count()
+
+    def get_planner_estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+    def get_estimate_count(self, queryset):
+        estimate = self.get_planner_estimate(queryset)
+        if estimate is None:
+            return self.get_exact_count(queryset)
+        return estimate
+
+    def get_auto_count(self, queryset):
+        if queryset.query.where:
+            return self.get_exact_count(queryset)
+        estimate = self.get_planner_estimate(queryset)
+        if estimate is None or estimate < self.count_threshold:
+            return self.get_exact_count(queryset)
+        return estimate
+
+    def get_cached_count(self, queryset):
+        params = sorted(
+            (key, value)
+            for key, values in self.request.query_params.lists()
+            if key not in (self.page_query_param, self.page_size_query_param)
+            for value in values
+        )
+        key_source = (
+            f'{self.request.path}:{self.request.user.pk}:{params}'
+        )
+        cache_key = 'pagination-count:' + hashlib.md5(
+            key_source.encode()
+        ).hexdigest()
+        return cache.get_or_set(
+            cache_key,
+            lambda: self.get_exact_count(queryset),
+            self.count_cache_timeout
+        )
+
+
+class RecipeCursorPagination(CursorPagination):
+    page_size_query_param = 'limit'
+    page_size = settings.PAGE_SIZE
+    ordering = ('-created_at', '-id')
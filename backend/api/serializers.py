@@ -3,6 +3,8 @@ import base64
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from djoser.serializers import UserCreateSerializer, UserSerializer
 from rest_framework import serializers
@@ -14,13 +16,50 @@ from recipes.models import (
     Ingredient,
     IngredientInRecipe,
     Recipe,
+    ShoppingListItem,
     Tag,
 )
 from users.models import Subscription
 
+from .utils import (
+    get_ingredients_prefetch,
+    get_recipes_limit,
+    get_requested_fields,
+    get_tags_prefetch,
+    invalidate_recipe_shopping_lists,
+)
+
 User = get_user_model()
 
 
+def prune_fields(serializer, field_paths):
+    nested_paths = {}
+    for path in field_paths:
+        name, _, nested_path = path.partition('.')
+        nested_paths.setdefault(name, [])
+        if nested_path:
+            nested_paths[name].append(nested_path)
+    for name in list(serializer.fields):
+        if name not in nested_paths:
+            serializer.fields.pop(name)
+    for name, paths in nested_paths.items():
+        field = serializer.fields.get(name)
+        field = getattr(field, 'child', field)
+        if paths and isinstance(field, serializers.Serializer):
+            prune_fields(field, paths)
+
+
+class SparseFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+        fields = get_requested_fields(request)
+        if fields is not None:
+            prune_fields(self, fields)
+
+
 class Base64ImageField(serializers.ImageField):
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
@@ -30,7 +69,7 @@ class Base64ImageField(serializers.ImageField):
         return super().to_internal_value(data)
 
 
-class CustomUserSerializer(UserSerializer):
+class CustomUserSerializer(SparseFieldsMixin, UserSerializer):
     is_subscribed = serializers.SerializerMethodField()
     avatar = Base64ImageField(allow_null=True, required=False)
 
@@ -47,6 +86,8 @@ class CustomUserSerializer(UserSerializer):
         )
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
@@ -125,7 +166,7 @@ class RecipeIngredientSerializer(serializers.ModelSerializer):
         )
 
 
-class ReadRecipeSerializer(serializers.ModelSerializer):
+class ReadRecipeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tags = TagSerializer(many=True)
     author = CustomUserSerializer()
     ingredients = RecipeIngredientSerializer(
@@ -152,7 +193,14 @@ class ReadRecipeSerializer(serializers.ModelSerializer):
         )
         model = Recipe
 
+    def to_representation(self, instance):
+        if hasattr(instance, 'author_is_subscribed'):
+            instance.author.is_subscribed = instance.author_is_subscribed
+        return super().to_representation(instance)
+
     def get_is_favorited(self, obj):
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return False
@@ -161,6 +209,8 @@ class ReadRecipeSerializer(serializers.ModelSerializer):
         ).exists()
 
     def get_is_in_shopping_cart(self, obj):
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return False
@@ -170,10 +220,7 @@ class ReadRecipeSerializer(serializers.ModelSerializer):
 
 
 class WriteRecipeIngredientSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all(),
-        source='ingredient'
-    )
+    id = serializers.IntegerField(source='ingredient')
 
     class Meta:
         model = IngredientInRecipe
@@ -188,9 +235,8 @@ class WriteRecipeIngredientSerializer(serializers.ModelSerializer):
 
 
 class WriteRecipeSerializer(serializers.ModelSerializer):
-    tags = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(),
-        many=True,
+    tags = serializers.ListField(
+        child=serializers.IntegerField(),
         required=True
     )
     ingredients = WriteRecipeIngredientSerializer(
@@ -234,16 +280,56 @@ class WriteRecipeSerializer(serializers.ModelSerializer):
         self.add_ingredients(ingredients, recipe)
         return recipe
 
+    def update_ingredients(self, ingredients, recipe):
+        existing = {
+            item.ingredient_id: item
+            for item in recipe.ingredient_recipe.all()
+        }
+        amounts = {}
+        to_create, to_update = [], []
+        for ingredient_data in ingredients:
+            ingredient = ingredient_data['ingredient']
+            amount = ingredient_data['amount']
+            item = existing.pop(ingredient.id, None)
+            if item is None:
+                to_create.append(IngredientInRecipe(
+                    recipe=recipe, ingredient=ingredient, amount=amount
+                ))
+                amounts[ingredient.id] = amount
+            elif item.amount != amount:
+                amounts[ingredient.id] = amount - item.amount
+                item.amount = amount
+                to_update.append(item)
+        if existing:
+            IngredientInRecipe.objects.filter(
+                id__in=[item.id for item in existing.values()]
+            ).delete()
+        IngredientInRecipe.objects.bulk_update(to_update, ['amount'])
+        IngredientInRecipe.objects.bulk_create(to_create)
+        return amounts
+
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients = validated_data.pop('ingredients')
         tags = validated_data.pop('tags')
-        instance.tags.set(tags)
-        IngredientInRecipe.objects.filter(recipe=instance).delete()
+        if set(instance.tags.all()) != set(tags):
+            instance.tags.set(tags)
         super().update(instance, validated_data)
-        self.add_ingredients(ingredients, instance)
+        amounts = self.update_ingredients(ingredients, instance)
+        if amounts:
+            ShoppingListItem.objects.apply_amounts(
+                instance.cartitem_items.values_list('user_id', flat=True),
+                amounts
+            )
+            invalidate_recipe_shopping_lists([instance.id])
+        if hasattr(instance, '_prefetched_objects_cache'):
+            instance._prefetched_objects_cache.pop('ingredient_recipe', None)
         return instance
 
     def to_representation(self, instance):
+        prefetch_related_objects(
+            [instance], get_ingredients_prefetch(), get_tags_prefetch()
+        )
         serializer = ReadRecipeSerializer(
             instance, context={'request': self.context.get('request')}
         )
@@ -262,24 +348,10 @@ class WriteRecipeSerializer(serializers.ModelSerializer):
                 'Нужно выбрать хотя бы 1 ингредиент!'
             )
 
-        existing_ingredient_ids = set(
-            Ingredient.objects.values_list('id', flat=True)
-        )
         seen_ingredient_ids = set()
 
         for ingredient_data in ingredients:
-            ingredient = ingredient_data.get('ingredient')
-            ingredient_id = ingredient.id if ingredient else None
-
-            if ingredient_id is None:
-                raise serializers.ValidationError(
-                    'Не удалось определить ID ингредиента.'
-                )
-
-            if ingredient_id not in existing_ingredient_ids:
-                raise serializers.ValidationError(
-                    f'Ингредиент с ID {ingredient_id} не существует.'
-                )
+            ingredient_id = ingredient_data['ingredient'].id
 
             if ingredient_id in seen_ingredient_ids:
                 raise serializers.ValidationError(
@@ -290,6 +362,27 @@ class WriteRecipeSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    def get_objects_by_ids(self, model, ids, error_message):
+        objects = model.objects.in_bulk(set(ids))
+        for object_id in ids:
+            if object_id not in objects:
+                raise serializers.ValidationError(
+                    error_message.format(id=object_id)
+                )
+        return objects
+
+    def validate_ingredients(self, value):
+        ingredients = self.get_objects_by_ids(
+            Ingredient,
+            [ingredient_data['ingredient'] for ingredient_data in value],
+            'Ингредиент с ID {id} не существует.'
+        )
+        for ingredient_data in value:
+            ingredient_data['ingredient'] = ingredients[
+                ingredient_data['ingredient']
+            ]
+        return value
+
     def validate_tags(self, value):
         if not value:
             raise serializers.ValidationError(
@@ -299,7 +392,10 @@ class WriteRecipeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 'Список тегов содержит дубликаты.'
             )
-        return value
+        tags = self.get_objects_by_ids(
+            Tag, value, 'Тег с ID {id} не существует.'
+        )
+        return [tags[tag_id] for tag_id in value]
 
     def validate_cooking_time(self, value):
         if value < 0:
@@ -321,6 +417,14 @@ class RecipeShortViewSerializer(serializers.ModelSerializer):
         model = Recipe
 
 
+class RecipeIdsSerializer(serializers.Serializer):
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_RECIPES_LIMIT
+    )
+
+
 class FavoriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = FavoriteItem
@@ -353,6 +457,14 @@ class ShoppingCartSerializer(serializers.ModelSerializer):
             )
         ]
 
+    @transaction.atomic
+    def create(self, validated_data):
+        cart_item = super().create(validated_data)
+        ShoppingListItem.objects.add_recipes(
+            [cart_item.user_id], [cart_item.recipe_id]
+        )
+        return cart_item
+
     def to_representation(self, instance):
         request = self.context.get('request')
         return RecipeShortViewSerializer(
@@ -369,7 +481,7 @@ class SubscriptionDetailSerializer(serializers.ModelSerializer):
     last_name = serializers.ReadOnlyField(source='author.last_name')
     is_subscribed = serializers.SerializerMethodField()
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.SerializerMethodField()
+    recipes_count = serializers.ReadOnlyField(source='author.recipes_count')
     avatar = Base64ImageField(
         source='author.avatar',
         required=False,
@@ -391,26 +503,19 @@ class SubscriptionDetailSerializer(serializers.ModelSerializer):
         )
 
     def get_is_subscribed(self, obj):
-        user = self.context.get('request').user
-        return Subscription.objects.filter(
-            user=user, author=obj.author
-        ).exists()
+        return True
 
     def get_recipes(self, obj):
         request = self.context.get('request')
-        recipes_limit = request.GET.get('recipes_limit', '6')
-        if recipes_limit.isdigit():
-            limit = int(recipes_limit)
-        else:
-            limit = settings.PAGE_SIZE
-        recipes = Recipe.objects.filter(author=obj.author)[:limit]
+        recipes = getattr(obj.author, 'limited_recipes', None)
+        if recipes is None:
+            recipes = Recipe.objects.filter(
+                author=obj.author
+            )[:get_recipes_limit(request)]
         return RecipeShortViewSerializer(
             recipes, many=True, context={'request': request}
         ).data
 
-    def get_recipes_count(self, obj):
-        return Recipe.objects.filter(author=obj.author).count()
-
 
 class SubscribeSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(
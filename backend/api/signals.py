@@ -0,0 +1,203 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from recipes.models import (
+    CartItem,
+    FavoriteItem,
+    Ingredient,
+    IngredientInRecipe,
+    Recipe,
+    ShoppingListItem,
+    Tag,
+)
+from users.models import Subscription
+
+from .authentication import invalidate_tokens
+from .utils import (
+    change_counter,
+    invalidate_recipe_responses,
+    invalidate_recipe_shopping_lists,
+    invalidate_response_cache,
+    invalidate_shopping_lists,
+)
+
+User = get_user_model()
+
+AUTHOR_FIELDS = {'email', 'username', 'first_name', 'last_name', 'avatar'}
+
+AUTHOR_COUNTERS = {
+    Recipe: 'recipes_count',
+    Subscription: 'subscribers_count',
+}
+
+
+@receiver([post_save, post_delete], sender=CartItem)
+def invalidate_cart_owner_shopping_list(sender, instance, **kwargs):
+    invalidate_shopping_lists([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=IngredientInRecipe)
+def invalidate_recipe_ingredient_shopping_lists(sender, instance, **kwargs):
+    invalidate_recipe_shopping_lists([instance.recipe_id])
+
+
+@receiver(post_save, sender=Ingredient)
+def invalidate_ingredient_shopping_lists(sender, instance, **kwargs):
+    invalidate_recipe_shopping_lists(
+        instance.ingredient_list.values('recipe_id')
+    )
+
+
+def get_cart_owner_ids(recipe_id):
+    return CartItem.objects.filter(
+        recipe_id=recipe_id
+    ).values_list('user_id', flat=True)
+
+
+@receiver(pre_save, sender=IngredientInRecipe)
+def remember_recipe_ingredient(sender, instance, **kwargs):
+    instance._stored_amount = None
+    if instance.pk is not None:
+        instance._stored_amount = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('ingredient_id', 'amount').first()
+
+
+@receiver(post_save, sender=IngredientInRecipe)
+def apply_recipe_ingredient_to_shopping_lists(sender, instance, **kwargs):
+    amounts = defaultdict(int)
+    stored_amount = getattr(instance, '_stored_amount', None)
+    if stored_amount is not None:
+        ingredient_id, amount = stored_amount
+        amounts[ingredient_id] -= amount
+    amounts[instance.ingredient_id] += instance.amount
+    ShoppingListItem.objects.apply_amounts(
+        get_cart_owner_ids(instance.recipe_id), amounts
+    )
+
+
+@receiver(pre_delete, sender=IngredientInRecipe)
+def remove_recipe_ingredient_from_shopping_lists(sender, instance, **kwargs):
+    ShoppingListItem.objects.apply_amounts(
+        get_cart_owner_ids(instance.recipe_id),
+        {instance.ingredient_id: -instance.amount}
+    )
+
+
+@receiver(post_save, sender=FavoriteItem)
+@receiver(post_save, sender=CartItem)
+def increment_recipe_counter(sender, instance, created, **kwargs):
+    if created:
+        change_counter(
+            Recipe.objects.filter(pk=instance.recipe_id),
+            sender.counter_field,
+            1
+        )
+
+
+@receiver(post_delete, sender=FavoriteItem)
+@receiver(post_delete, sender=CartItem)
+def decrement_recipe_counter(sender, instance, **kwargs):
+    change_counter(
+        Recipe.objects.filter(pk=instance.recipe_id), sender.counter_field, -1
+    )
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_save, sender=Subscription)
+def increment_author_counter(sender, instance, created, **kwargs):
+    if created:
+        change_counter(
+            User.objects.filter(pk=instance.author_id),
+            AUTHOR_COUNTERS[sender],
+            1
+        )
+
+
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=Subscription)
+def decrement_author_counter(sender, instance, **kwargs):
+    change_counter(
+        User.objects.filter(pk=instance.author_id), AUTHOR_COUNTERS[sender], -1
+    )
+
+
+def touch_recipes(recipes):
+    recipe_ids = list(recipes.values_list('id', flat=True))
+    Recipe.objects.filter(id__in=recipe_ids).update(updated_at=timezone.now())
+    invalidate_recipe_responses(recipe_ids)
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+def invalidate_recipe_response(sender, instance, **kwargs):
+    invalidate_recipe_responses([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=IngredientInRecipe)
+def touch_ingredient_recipe(sender, instance, **kwargs):
+    touch_recipes(Recipe.objects.filter(pk=instance.recipe_id))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def touch_tagged_recipes(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch_recipes(Recipe.objects.filter(pk=instance.pk))
+    elif action == 'pre_clear':
+        touch_recipes(instance.recipes.all())
+    else:
+        touch_recipes(Recipe.objects.filter(pk__in=pk_set))
+
+
+@receiver([post_save, pre_delete], sender=Tag)
+def touch_tag_recipes(sender, instance, created=False, **kwargs):
+    invalidate_response_cache(['tags'])
+    if not created:
+        touch_recipes(Recipe.objects.filter(tags=instance))
+
+
+@receiver([post_save, pre_delete], sender=Ingredient)
+def touch_ingredient_recipes(sender, instance, created=False, **kwargs):
+    invalidate_response_cache(['ingredients'])
+    if not created:
+        touch_recipes(Recipe.objects.filter(ingredients=instance))
+
+
+@receiver(post_save, sender=User)
+def touch_author_recipes(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields and not AUTHOR_FIELDS & set(update_fields):
+        return
+    invalidate_response_cache([f'user:{instance.pk}'])
+    touch_recipes(Recipe.objects.filter(author=instance))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_response(sender, instance, **kwargs):
+    invalidate_response_cache([f'user:{instance.pk}'])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_tokens(
+            Token.objects.filter(user=instance).values_list('key', flat=True)
+        )
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_tokens([instance.key])
@@ -5,6 +5,7 @@ from api.views import (
     CustomUserViewSet,
     IngredientViewSet,
     RecipeViewSet,
+    ResponseCacheStatsView,
     TagViewSet,
 )
 
@@ -27,6 +28,7 @@ router.register(
 
 
 urlpatterns = [
+    path('cache/stats/', ResponseCacheStatsView.as_view()),
     path('', include(router.urls)),
     path('', include('djoser.urls')),
     path('auth/', include('djoser.urls.authtoken')),
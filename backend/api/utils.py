@@ -1,33 +1,329 @@
-from io import BytesIO
+import csv
+import gzip
+import hashlib
+import json
+import uuid
+from urllib.parse import urlencode
 
-from django.db.models import Sum
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Prefetch, Subquery
 
-from recipes.models import CartItem, IngredientInRecipe
+from api.renderers import FastJSONRenderer
+from recipes.models import (
+    CartItem,
+    FavoriteItem,
+    Ingredient,
+    IngredientInRecipe,
+    Recipe,
+    ShoppingListItem,
+    Tag,
+)
+from users.models import Subscription
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
-def generate_shopping_list(user):
-    cart_items = CartItem.objects.filter(
-        user=user
-    ).values_list(
-        'recipe', flat=True
+User = get_user_model()
+
+ingredient_catalogue = {}
+
+
+def get_ingredients_prefetch():
+    return Prefetch(
+        'ingredient_recipe',
+        queryset=IngredientInRecipe.objects.select_related(
+            'ingredient'
+        ).order_by('id')
+    )
+
+
+def get_tags_prefetch():
+    return Prefetch('tags', queryset=Tag.objects.order_by('id'))
+
+
+def change_counter(queryset, field_name, delta):
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field_name}__gte': -delta})
+    queryset.update(**{field_name: F(field_name) + delta})
+
+
+def lock_user(user_id):
+    return User.objects.select_for_update().only('id').get(pk=user_id)
+
+
+def get_etag(*parts):
+    return '"%s"' % hashlib.md5(
+        ':'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+
+
+def get_viewer_marker(user):
+    if not user.is_authenticated:
+        return ''
+    markers = {}
+    for name, model in (
+        ('favorites', FavoriteItem),
+        ('cart', CartItem),
+        ('subscriptions', Subscription),
+    ):
+        items = model.objects.filter(
+            user=OuterRef('pk')
+        ).order_by().values('user')
+        markers[f'{name}_count'] = Subquery(
+            items.annotate(value=Count('id')).values('value')
+        )
+        markers[f'{name}_last_id'] = Subquery(
+            items.annotate(value=Max('id')).values('value')
+        )
+    values = User.objects.filter(pk=user.pk).annotate(
+        **markers
+    ).values_list(*markers).first()
+    return ':'.join(str(value) for value in (user.pk, *values))
+
+
+def get_ingredient_catalogue_version():
+    markers = Ingredient.objects.aggregate(
+        count=Count('id'),
+        last_id=Max('id'),
+        updated_at=Max('updated_at'),
     )
+    return hashlib.md5(
+        ':'.join(str(marker) for marker in markers.values()).encode()
+    ).hexdigest()
+
+
+def get_ingredient_catalogue(version):
+    if ingredient_catalogue.get('version') != version:
+        body = FastJSONRenderer().render(list(
+            Ingredient.objects.order_by('id').values(
+                'id', 'name', 'measurement_unit'
+            )
+        ))
+        variants = {
+            'identity': body,
+            'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            variants['br'] = brotli.compress(body)
+        ingredient_catalogue.clear()
+        ingredient_catalogue.update(version=version, variants=variants)
+    return ingredient_catalogue['variants']
+
+
+def get_accepted_encoding(request, encodings):
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        encoding, _, params = part.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+            accepted.add(encoding.strip())
+    for encoding in ('br', 'gzip'):
+        if encoding in encodings and encoding in accepted:
+            return encoding
+    return 'identity'
+
+
+def get_response_cache_generation(namespace):
+    key = f'response-generation:{namespace}'
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def get_response_cache_key(namespace, request):
+    query = urlencode(sorted(
+        (param, ','.join(request.query_params.getlist(param)))
+        for param in request.query_params
+    ))
+    return 'response:{}:{}:{}'.format(
+        namespace,
+        get_response_cache_generation(namespace),
+        hashlib.md5(
+            f'{request.scheme}://{request.get_host()}{request.path}?{query}:'
+            f'{request.accepted_media_type}'.encode()
+        ).hexdigest()
+    )
+
+
+def invalidate_response_cache(namespaces):
+    namespaces = set(namespaces)
+
+    def invalidate():
+        cache.set_many(
+            {
+                f'response-generation:{namespace}': uuid.uuid4().hex
+                for namespace in namespaces
+            },
+            None
+        )
+
+    transaction.on_commit(invalidate)
+
+
+def invalidate_recipe_responses(recipe_ids):
+    invalidate_response_cache([
+        'recipes', *(f'recipe:{recipe_id}' for recipe_id in recipe_ids)
+    ])
+
+
+def count_response_cache(name, hit):
+    key = 'response-stats:{}:{}'.format(name, 'hits' if hit else 'misses')
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_response_cache_stats():
+    names = ('recipes', 'tags', 'ingredients', 'users')
+    counters = cache.get_many([
+        f'response-stats:{name}:{counter}'
+        for name in names
+        for counter in ('hits', 'misses')
+    ])
+    stats = {}
+    for name in names:
+        hits = counters.get(f'response-stats:{name}:hits', 0)
+        misses = counters.get(f'response-stats:{name}:misses', 0)
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 3)
+            if hits + misses else None,
+        }
+    return stats
+
+
+def get_recipe_card_key(request, recipe_id, updated_at):
+    return 'recipe-card:{}:{}:{}:{}'.format(
+        request.scheme,
+        request.get_host(),
+        recipe_id,
+        updated_at.isoformat(),
+    )
+
+
+def get_requested_fields(request):
+    fields = request.query_params.get('fields')
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+def get_requested_field_names(request, available_fields):
+    fields = get_requested_fields(request)
+    if fields is None:
+        return set(available_fields)
+    return {field.split('.')[0] for field in fields} & set(available_fields)
+
+
+def get_recipes_limit(request):
+    recipes_limit = request.GET.get('recipes_limit', '')
+    if recipes_limit.isdigit():
+        return int(recipes_limit)
+    return settings.PAGE_SIZE
+
+
+def get_limited_recipes_prefetch(lookup, limit):
+    latest_ids = Recipe.objects.filter(
+        author=OuterRef('author')
+    ).values('id')[:limit]
+    return Prefetch(
+        lookup,
+        queryset=Recipe.objects.filter(id__in=Subquery(latest_ids)),
+        to_attr='limited_recipes'
+    )
+
+
+def get_shopping_list_cache_key(user_id):
+    return f'shopping-list:{user_id}'
+
+
+def invalidate_shopping_lists(user_ids):
+    keys = [get_shopping_list_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_recipe_shopping_lists(recipe_ids):
+    invalidate_shopping_lists(
+        CartItem.objects.filter(
+            recipe_id__in=recipe_ids
+        ).values_list('user_id', flat=True)
+    )
+
+
+def iter_shopping_list_items(user):
+    cache_key = get_shopping_list_cache_key(user.id)
+    items = cache.get(cache_key)
+    if items is not None:
+        yield from items
+        return
+    items = []
     ingredients_summary = (
-        IngredientInRecipe.objects
-        .filter(recipe__in=cart_items)
-        .values('ingredient__name', 'ingredient__measurement_unit')
-        .annotate(total_amount=Sum('amount'))
+        ShoppingListItem.objects
+        .filter(user=user)
+        .values_list(
+            'ingredient__name',
+            'ingredient__measurement_unit',
+            'total_amount'
+        )
         .order_by('ingredient__name')
     )
-    shopping_list_text = 'Список покупок:\n\n'
-    for item in ingredients_summary:
-        ingredient_name = item['ingredient__name']
-        total_amount = item['total_amount']
-        unit = item['ingredient__measurement_unit']
-        shopping_list_text += (
-            f'{ingredient_name} — {total_amount} {unit}\n'
+    for item in ingredients_summary.iterator():
+        items.append(item)
+        yield item
+    cache.set(cache_key, items, settings.SHOPPING_LIST_CACHE_TIMEOUT)
+
+
+def render_shopping_list_txt(items):
+    yield 'Список покупок:\n\n'
+    for name, unit, total_amount in items:
+        yield f'{name} — {total_amount} {unit}\n'
+
+
+def render_shopping_list_csv(items):
+    writer = csv.writer(Echo())
+    yield writer.writerow(('Ингредиент', 'Количество', 'Единица измерения'))
+    for name, unit, total_amount in items:
+        yield writer.writerow((name, total_amount, unit))
+
+
+def render_shopping_list_json(items):
+    separator = ''
+    yield '['
+    for name, unit, total_amount in items:
+        yield separator + json.dumps(
+            {
+                'name': name,
+                'measurement_unit': unit,
+                'amount': total_amount,
+            },
+            ensure_ascii=False
         )
+        separator = ','
+    yield ']'
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+SHOPPING_LIST_RENDERERS = {
+    'txt': render_shopping_list_txt,
+    'csv': render_shopping_list_csv,
+    'json': render_shopping_list_json,
+}
+
 
-    buffer = BytesIO()
-    buffer.write(shopping_list_text.encode('utf-8'))
-    buffer.seek(0)
-    return buffer
+def generate_shopping_list(user, file_format):
+    renderer = SHOPPING_LIST_RENDERERS[file_format]
+    for chunk in renderer(iter_shopping_list_items(user)):
+        yield chunk.encode('utf-8')
@@ -1,55 +1,479 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count
-from django.http import Http404, HttpResponse
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Count, Exists, Max, OuterRef, Value
+from django.db.models.functions import Length
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import (
     AllowAny,
+    IsAdminUser,
     IsAuthenticated,
     IsAuthenticatedOrReadOnly,
 )
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
 
-from api.pagination import CustomLimitPagination
+from api.fast_serializers import FastRecipeSerializer
+from api.pagination import (
+    CustomLimitPagination,
+    FastCountPagination,
+    RecipeCursorPagination,
+)
 from api.serializers import (
     AvatarSerializer,
     CustomUserSerializer,
     FavoriteSerializer,
     IngredientSerializer,
     ReadRecipeSerializer,
+    RecipeIdsSerializer,
     ShoppingCartSerializer,
     SubscribeSerializer,
     SubscriptionDetailSerializer,
     TagSerializer,
     WriteRecipeSerializer,
 )
-from recipes.models import CartItem, FavoriteItem, Ingredient, Recipe, Tag
+from recipes.models import (
+    CartItem,
+    FavoriteItem,
+    Ingredient,
+    Recipe,
+    ShoppingListItem,
+    Tag,
+)
 from users.models import Subscription
 
 from .filters import IngredientFilter, RecipeFilter
 from .permissions import IsAdminAuthorOrReadOnly
-from .utils import generate_shopping_list
+from .renderers import CSVRenderer, PlainTextRenderer
+from .utils import (
+    change_counter,
+    count_response_cache,
+    generate_shopping_list,
+    get_accepted_encoding,
+    get_etag,
+    get_ingredient_catalogue,
+    get_ingredient_catalogue_version,
+    get_ingredients_prefetch,
+    get_limited_recipes_prefetch,
+    get_recipe_card_key,
+    get_recipes_limit,
+    get_requested_field_names,
+    get_requested_fields,
+    get_response_cache_key,
+    get_response_cache_stats,
+    get_tags_prefetch,
+    get_viewer_marker,
+    invalidate_shopping_lists,
+    lock_user,
+)
 
 User = get_user_model()
 
+CACHED_RESPONSE_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Vary')
+
+
+class ConditionalGetMixin:
+    def get_validator_queryset(self):
+        return self.get_queryset()
+
+    def get_viewer_marker(self):
+        return ''
+
+    def get_validators(self, request, **kwargs):
+        queryset = self.filter_queryset(self.get_validator_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in kwargs:
+            try:
+                queryset = queryset.filter(
+                    **{self.lookup_field: kwargs[lookup_url_kwarg]}
+                )
+            except (TypeError, ValueError):
+                return None, None
+        markers = queryset.aggregate(
+            count=Count('id'),
+            last_id=Max('id'),
+            updated_at=Max('updated_at'),
+        )
+        if not markers['count']:
+            return None, None
+        viewer_marker = self.get_viewer_marker()
+        etag = get_etag(
+            request.accepted_media_type,
+            markers['count'],
+            markers['last_id'],
+            markers['updated_at'].isoformat(),
+            viewer_marker,
+        )
+        last_modified = None
+        if lookup_url_kwarg in kwargs and not viewer_marker:
+            last_modified = int(markers['updated_at'].timestamp())
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, **kwargs)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if etag and (
+            200 <= response.status_code < 300
+            or response.status_code == status.HTTP_304_NOT_MODIFIED
+        ):
+            response.headers.setdefault('ETag', etag)
+            if last_modified:
+                response.headers.setdefault(
+                    'Last-Modified', http_date(last_modified)
+                )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ResponseCacheMixin:
+    response_cache_list_namespace = None
+    response_cache_detail_namespace = None
+
+    def get_response_cache_namespace(self, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg not in kwargs:
+            return self.response_cache_list_namespace
+        lookup = kwargs[lookup_url_kwarg]
+        if self.response_cache_detail_namespace is None or (
+            not lookup.isdigit()
+        ):
+            return None
+        return self.response_cache_detail_namespace.format(pk=int(lookup))
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        namespace = self.get_response_cache_namespace(**kwargs)
+        if (
+            namespace is None
+            or request.user.is_authenticated
+            or request.accepted_renderer.format != 'json'
+        ):
+            return handler(request, *args, **kwargs)
+        key = get_response_cache_key(namespace, request)
+        cached = cache.get(key)
+        count_response_cache(self.basename, cached is not None)
+        if cached is None:
+            self.response_cache_key = key
+            return handler(request, *args, **kwargs)
+        content, headers = cached
+        response = HttpResponse(content)
+        for header, value in headers.items():
+            response[header] = value
+        response['X-Cache'] = 'HIT'
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(
+                response.get('Last-Modified', '')
+            ),
+            response=response,
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        key = getattr(self, 'response_cache_key', None)
+        if key and isinstance(response, Response) and (
+            response.status_code == status.HTTP_200_OK
+        ):
+            response.render()
+            response['X-Cache'] = 'MISS'
+            cache.set(
+                key,
+                (
+                    response.content,
+                    {
+                        header: response[header]
+                        for header in CACHED_RESPONSE_HEADERS
+                        if response.has_header(header)
+                    },
+                ),
+                settings.RESPONSE_CACHE_TIMEOUT,
+            )
+        return response
+
+
+class FastRecipeReadMixin:
+    def use_fast_serializer(self):
+        return (
+            settings.FAST_RECIPE_SERIALIZATION
+            and get_requested_fields(self.request) is None
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_serializer():
+            return super().list(request, *args, **kwargs)
+        serializer = FastRecipeSerializer(request)
+        queryset = serializer.get_values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(list(queryset)))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_fast_serializer():
+            return super().retrieve(request, *args, **kwargs)
+        serializer = FastRecipeSerializer(request)
+        try:
+            rows = list(serializer.get_values(
+                self.get_queryset().filter(pk=kwargs['pk'])
+            ))
+        except (TypeError, ValueError):
+            raise Http404
+        if not rows:
+            raise Http404
+        return Response(serializer.serialize(rows)[0])
+
+
+class RecipeCardMixin:
+    viewer_flags = (
+        'is_favorited',
+        'is_in_shopping_cart',
+        'author_is_subscribed',
+    )
+
+    def use_recipe_cards(self):
+        return (
+            settings.RECIPE_CARD_CACHE
+            and get_requested_fields(self.request) is None
+        )
+
+    def get_card_rows(self, queryset):
+        return queryset.prefetch_related(None).values(
+            'id', 'created_at', 'updated_at', *self.viewer_flags
+        )
+
+    def render_recipe_cards(self, recipe_ids):
+        queryset = Recipe.objects.filter(
+            id__in=recipe_ids
+        ).select_related('author').prefetch_related(
+            get_ingredients_prefetch(), get_tags_prefetch()
+        ).annotate(**{
+            flag: Value(False, output_field=BooleanField())
+            for flag in self.viewer_flags
+        })
+        if self.use_fast_serializer():
+            serializer = FastRecipeSerializer(self.request)
+            cards = serializer.serialize(
+                list(serializer.get_values(queryset))
+            )
+        else:
+            cards = ReadRecipeSerializer(
+                queryset, many=True, context=self.get_serializer_context()
+            ).data
+        return {card['id']: card for card in cards}
+
+    def get_recipe_cards(self, rows):
+        keys = {
+            row['id']: get_recipe_card_key(
+                self.request, row['id'], row['updated_at']
+            )
+            for row in rows
+        }
+        cards = cache.get_many(keys.values())
+        missing_ids = [
+            recipe_id for recipe_id, key in keys.items() if key not in cards
+        ]
+        if missing_ids:
+            rendered = {
+                keys[recipe_id]: card
+                for recipe_id, card in self.render_recipe_cards(
+                    missing_ids
+                ).items()
+            }
+            cache.set_many(rendered, settings.RECIPE_CARD_CACHE_TIMEOUT)
+            cards.update(rendered)
+        results = []
+        for row in rows:
+            card = dict(cards[keys[row['id']]])
+            card['author'] = dict(
+                card['author'], is_subscribed=row['author_is_subscribed']
+            )
+            card['is_favorited'] = row['is_favorited']
+            card['is_in_shopping_cart'] = row['is_in_shopping_cart']
+            results.append(card)
+        return results
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+    def list(self, request, *args, **kwargs):
+        if not self.use_recipe_cards():
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_card_rows(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_recipe_cards(page))
+        return Response(self.get_recipe_cards(list(queryset)))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_recipe_cards():
+            return super().retrieve(request, *args, **kwargs)
+        try:
+            rows = list(self.get_card_rows(
+                self.get_queryset().filter(pk=kwargs['pk'])
+            ))
+        except (TypeError, ValueError):
+            raise Http404
+        if not rows:
+            raise Http404
+        return Response(self.get_recipe_cards(rows)[0])
+
+
+class IngredientViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     permission_classes = (AllowAny,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientFilter
+    response_cache_list_namespace = 'ingredients'
+    response_cache_detail_namespace = 'ingredients'
     search_fields = ('^name',)
 
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json' or any(
+            name in request.query_params
+            for name in self.filterset_class.base_filters
+        ):
+            return super().list(request, *args, **kwargs)
+        return self.catalogue_response(
+            request, get_ingredient_catalogue_version(), 'no-cache'
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list' and self.request.query_params.get('search'):
+            return queryset[:settings.SEARCH_RESULTS_LIMIT]
+        return queryset
 
-class CustomUserViewSet(UserViewSet):
-    queryset = User.objects.annotate(recipes_count=Count('recipes'))
+    def catalogue_response(self, request, version, cache_control):
+        variants = get_ingredient_catalogue(version)
+        encoding = get_accepted_encoding(request, variants)
+        etag = get_etag(version, encoding)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                variants[encoding], content_type='application/json'
+            )
+            if encoding != 'identity':
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def catalogue_redirect(self, request, version):
+        response = HttpResponseRedirect(reverse(
+            'api:ingredients-catalogue-version',
+            kwargs={'version': version},
+            request=request,
+        ))
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    @action(detail=False, methods=['get'])
+    def catalogue(self, request):
+        return self.catalogue_redirect(
+            request, get_ingredient_catalogue_version()
+        )
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path=r'catalogue/(?P<version>[0-9a-f]{32})',
+        url_name='catalogue-version',
+    )
+    def catalogue_version(self, request, version):
+        current_version = get_ingredient_catalogue_version()
+        if version != current_version:
+            return self.catalogue_redirect(request, current_version)
+        return self.catalogue_response(
+            request,
+            version,
+            f'public, max-age={settings.INGREDIENT_CATALOGUE_MAX_AGE}, '
+            'immutable',
+        )
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        limit = request.query_params.get('limit', '')
+        max_limit = settings.INGREDIENT_AUTOCOMPLETE_LIMIT
+        limit = min(int(limit), max_limit) if limit.isdigit() else max_limit
+        ingredients = Ingredient.objects.filter(
+            name__istartswith=request.query_params.get('name', '')
+        ).order_by(
+            Length('name'), 'name'
+        ).values('id', 'name', 'measurement_unit')[:limit]
+        return Response(list(ingredients), status=status.HTTP_200_OK)
+
+
+class CustomUserViewSet(ResponseCacheMixin, UserViewSet):
+    queryset = User.objects.all()
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = CustomLimitPagination
+    response_cache_detail_namespace = 'user:{pk}'
+    user_columns = {'email', 'username', 'first_name', 'last_name', 'avatar'}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        fields = get_requested_field_names(
+            self.request, CustomUserSerializer.Meta.fields
+        )
+        queryset = queryset.only('id', *(fields & self.user_columns))
+        if 'is_subscribed' not in fields:
+            return queryset
+        user = self.request.user
+        if not user.is_authenticated:
+            return queryset.annotate(
+                is_subscribed=Value(False, output_field=BooleanField())
+            )
+        return queryset.annotate(is_subscribed=Exists(
+            Subscription.objects.filter(user=user, author=OuterRef('pk'))
+        ))
 
     @action(
         detail=False,
@@ -107,7 +531,9 @@ class CustomUserViewSet(UserViewSet):
         subscriptions = (
             Subscription.objects.filter(user=user)
             .select_related('author')
-            .annotate(recipes_count=Count('author__recipes'))
+            .prefetch_related(get_limited_recipes_prefetch(
+                'author__recipes', get_recipes_limit(request)
+            ))
         )
         page = self.paginate_queryset(subscriptions)
         if page is not None:
@@ -158,21 +584,88 @@ class CustomUserViewSet(UserViewSet):
             )
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = (IsAdminAuthorOrReadOnly,)
+    response_cache_list_namespace = 'tags'
+    response_cache_detail_namespace = 'tags'
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
-    queryset = Recipe.objects.select_related(
-        'author'
-    ).prefetch_related(
-        'ingredients', 'tags'
-    )
+class RecipeViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    RecipeCardMixin,
+    FastRecipeReadMixin,
+    viewsets.ModelViewSet,
+):
+    recipe_columns = {'name', 'image', 'text', 'cooking_time', 'author'}
     permission_classes = (IsAdminAuthorOrReadOnly,)
-    pagination_class = CustomLimitPagination
+    pagination_class = FastCountPagination
     filterset_class = RecipeFilter
+    response_cache_list_namespace = 'recipes'
+    response_cache_detail_namespace = 'recipe:{pk}'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            cursor_param = RecipeCursorPagination.cursor_query_param
+            if cursor_param in self.request.query_params:
+                self._paginator = RecipeCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_validator_queryset(self):
+        return Recipe.objects.all()
+
+    def get_viewer_marker(self):
+        return get_viewer_marker(self.request.user)
+
+    def paginate_queryset(self, queryset):
+        if self.request.query_params.get('ids'):
+            return None
+        return super().paginate_queryset(queryset)
+
+    def get_queryset(self):
+        fields = set(ReadRecipeSerializer.Meta.fields)
+        if self.action in ('list', 'retrieve'):
+            fields = get_requested_field_names(self.request, fields)
+        queryset = Recipe.objects.only(
+            'id', 'created_at', 'updated_at', *(fields & self.recipe_columns)
+        )
+        if 'author' in fields:
+            queryset = queryset.select_related('author')
+        if 'ingredients' in fields:
+            queryset = queryset.prefetch_related(get_ingredients_prefetch())
+        if 'tags' in fields:
+            queryset = queryset.prefetch_related(get_tags_prefetch())
+        return queryset.annotate(**self.get_viewer_flags(fields))
+
+    def get_viewer_flags(self, fields):
+        user = self.request.user
+        flags = {
+            'is_favorited': (FavoriteItem, 'recipe', 'pk'),
+            'is_in_shopping_cart': (CartItem, 'recipe', 'pk'),
+            'author_is_subscribed': (Subscription, 'author', 'author'),
+        }
+        if 'author' in fields:
+            fields = fields | {'author_is_subscribed'}
+        annotations = {}
+        for name, (model, field_name, outer_field) in flags.items():
+            if name not in fields:
+                continue
+            if not user.is_authenticated:
+                annotations[name] = Value(False, output_field=BooleanField())
+                continue
+            annotations[name] = Exists(model.objects.filter(
+                user=user, **{field_name: OuterRef(outer_field)}
+            ))
+        return annotations
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve', 'get-link'):
@@ -185,21 +678,29 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def recipe_post_delete(self, request, pk, model, serializer_class):
         if request.method == 'POST':
             recipe = get_object_or_404(Recipe, id=pk)
-            serializer = serializer_class(
-                data={
-                    'user': request.user.id,
-                    'recipe': recipe.id,
-                },
-                context={'request': request}
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
+            with transaction.atomic():
+                lock_user(request.user.id)
+                serializer = serializer_class(
+                    data={
+                        'user': request.user.id,
+                        'recipe': recipe.id,
+                    },
+                    context={'request': request}
+                )
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         elif request.method == 'DELETE':
-            deleted_count, _ = model.objects.filter(
-                user=request.user,
-                recipe_id=pk
-            ).delete()
+            with transaction.atomic():
+                lock_user(request.user.id)
+                deleted_count, _ = model.objects.filter(
+                    user=request.user,
+                    recipe_id=pk
+                ).delete()
+                if deleted_count > 0 and model is CartItem:
+                    ShoppingListItem.objects.remove_recipes(
+                        [request.user.id], [pk]
+                    )
 
             if deleted_count > 0:
                 return Response(status=status.HTTP_204_NO_CONTENT)
@@ -208,6 +709,70 @@ class RecipeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    def recipe_bulk_post_delete(self, request, model):
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        recipe_ids = list(dict.fromkeys(serializer.validated_data['recipes']))
+        user = request.user
+        with transaction.atomic():
+            lock_user(user.id)
+            existing_ids = set(
+                Recipe.objects.filter(
+                    id__in=recipe_ids
+                ).values_list('id', flat=True)
+            )
+            linked_ids = set(
+                model.objects.select_for_update().filter(
+                    user=user, recipe_id__in=recipe_ids
+                ).values_list('recipe_id', flat=True)
+            )
+            if request.method == 'POST':
+                changed_ids = [
+                    recipe_id for recipe_id in recipe_ids
+                    if recipe_id in existing_ids
+                    and recipe_id not in linked_ids
+                ]
+                model.objects.bulk_create([
+                    model(user=user, recipe_id=recipe_id)
+                    for recipe_id in changed_ids
+                ])
+                change_counter(
+                    Recipe.objects.filter(id__in=changed_ids),
+                    model.counter_field,
+                    1
+                )
+                if model is CartItem:
+                    ShoppingListItem.objects.add_recipes(
+                        [user.id], changed_ids
+                    )
+                changed_status, unchanged_status = 'added', 'exists'
+            else:
+                changed_ids = [
+                    recipe_id for recipe_id in recipe_ids
+                    if recipe_id in linked_ids
+                ]
+                model.objects.filter(
+                    user=user, recipe_id__in=changed_ids
+                ).delete()
+                if model is CartItem:
+                    ShoppingListItem.objects.remove_recipes(
+                        [user.id], changed_ids
+                    )
+                changed_status, unchanged_status = 'removed', 'missing'
+        if model is CartItem and changed_ids:
+            invalidate_shopping_lists([user.id])
+        changed_ids = set(changed_ids)
+        results = []
+        for recipe_id in recipe_ids:
+            if recipe_id not in existing_ids:
+                recipe_status = 'not_found'
+            elif recipe_id in changed_ids:
+                recipe_status = changed_status
+            else:
+                recipe_status = unchanged_status
+            results.append({'id': recipe_id, 'status': recipe_status})
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
     @action(
         detail=True,
         methods=['post', 'delete'],
@@ -234,6 +799,24 @@ class RecipeViewSet(viewsets.ModelViewSet):
             ShoppingCartSerializer
         )
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='favorite/bulk',
+        permission_classes=[IsAuthenticated, ]
+    )
+    def favorite_bulk(self, request):
+        return self.recipe_bulk_post_delete(request, FavoriteItem)
+
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='shopping_cart/bulk',
+        permission_classes=[IsAuthenticated, ]
+    )
+    def shopping_cart_bulk(self, request):
+        return self.recipe_bulk_post_delete(request, CartItem)
+
     @action(detail=True, methods=['get'], url_path='get-link')
     def get_link(self, request, pk=None):
         try:
@@ -255,12 +838,27 @@ class RecipeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    @action(detail=False, methods=['get'], url_path='download_shopping_cart')
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='download_shopping_cart',
+        permission_classes=(IsAuthenticated,),
+        renderer_classes=(PlainTextRenderer, CSVRenderer, JSONRenderer)
+    )
     def download_shopping_list(self, request):
-        user = request.user
-        buffer = generate_shopping_list(user)
-        response = HttpResponse(buffer, content_type='text/plain')
+        file_format = request.accepted_renderer.format
+        response = StreamingHttpResponse(
+            generate_shopping_list(request.user, file_format),
+            content_type=request.accepted_renderer.media_type
+        )
         response['Content-Disposition'] = (
-            'attachment; filename="shopping_list.txt"'
+            f'attachment; filename="shopping_list.{file_format}"'
         )
         return response
+
+
+class ResponseCacheStatsView(APIView):
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(get_response_cache_stats())
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -22,6 +23,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'djoser',
@@ -63,6 +65,37 @@ TEMPLATES = [
 WSGI_APPLICATION = 'foodgram.wsgi.application'
 
 
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+CACHE_BACKENDS = {
+    'locmem': (
+        'django.core.cache.backends.locmem.LocMemCache',
+        'foodgram',
+    ),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        os.path.join(tempfile.gettempdir(), 'foodgram_cache'),
+    ),
+    'redis': (
+        'django_redis.cache.RedisCache',
+        'redis://127.0.0.1:6379/1',
+    ),
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]
+        ),
+    }
+}
+
+if CACHE_BACKEND != 'redis':
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 10000)),
+    }
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -93,8 +126,33 @@ AUTH_PASSWORD_VALIDATORS = [
 
 PAGE_SIZE = 6
 
+PAGINATION_COUNT_STRATEGY = os.getenv('PAGINATION_COUNT_STRATEGY', 'auto')
+
+PAGINATION_COUNT_THRESHOLD = 10000
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+
+INGREDIENT_AUTOCOMPLETE_LIMIT = 20
+INGREDIENT_CATALOGUE_MAX_AGE = 60 * 60 * 24 * 365
+
+SEARCH_RESULTS_LIMIT = 50
+
+SHOPPING_LIST_CACHE_TIMEOUT = 60 * 60 * 24
+
+BULK_RECIPES_LIMIT = 100
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+AUTH_TOKEN_CACHE_TIMEOUT = 60
+RECIPE_CARD_CACHE = os.getenv('RECIPE_CARD_CACHE', 'True') == 'True'
+RECIPE_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+FAST_RECIPE_SERIALIZATION = (
+    os.getenv('FAST_RECIPE_SERIALIZATION', 'False') == 'True'
+)
+
 LANGUAGE_CODE = 'ru-RU'
 
+SEARCH_CONFIG = 'russian'
+
 TIME_ZONE = 'UTC'
 
 USE_I18N = True
@@ -121,11 +179,20 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 
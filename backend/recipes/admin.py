@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.db.models import Count
 
 from .models import Ingredient, Recipe, Tag
 
@@ -63,8 +62,6 @@ class RecipeAdmin(admin.ModelAdmin):
             'author'
         ).prefetch_related(
             'ingredients', 'tags'
-        ).annotate(
-            favorites_count=Count('favoriteitem_items')
         )
         return queryset
 
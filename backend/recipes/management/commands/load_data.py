@@ -1,52 +1,98 @@
 import csv
+import hashlib
+import json
+from itertools import islice
+from pathlib import Path
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
-from recipes.models import Ingredient
+from api.utils import invalidate_response_cache
+from recipes.models import Ingredient, LoadedFile
+
+BATCH_SIZE = 500
 
 
 class Command(BaseCommand):
-    help = 'Загружает данные из CSV файла в модель Product'
+    help = 'Загружает ингредиенты из CSV или JSON файла в модель Ingredient'
 
     def add_arguments(self, parser):
-        parser.add_argument('file_path', type=str, help='Путь к CSV файлу')
+        parser.add_argument(
+            'file_path', type=str, help='Путь к CSV или JSON файлу'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Загрузить файл, даже если он не изменился'
+        )
 
     def handle(self, *args, **kwargs):
-        file_path = kwargs['file_path']
+        file_path = Path(kwargs['file_path'])
         try:
-            with open(file_path, mode='r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if len(row) != 2:
-                        self.stdout.write(self.style.WARNING(
-                            f'Пропущена некорректная строка: {row}'
-                        ))
-                        continue
-                    name, measurement_unit = row
-                    try:
-                        obj, created = Ingredient.objects.get_or_create(
-                            name=name,
-                            defaults={'measurement_unit': measurement_unit}
-                        )
-                        if created:
-                            self.stdout.write(self.style.SUCCESS(
-                                f'Добавлен объект: {name} ({measurement_unit})'
-                            ))
-                        else:
-                            self.stdout.write(
-                                self.style.NOTICE(
-                                    'Объект уже существует:'
-                                    f'{name} ({measurement_unit})'
-                                )
-                            )
-                    except Exception as e:
-                        self.stdout.write(
-                            self.style.ERROR(
-                                'Ошибка при добавлении объекта'
-                                f'{name} ({measurement_unit}): {e}'
-                            )
-                        )
+            checksum = self.get_checksum(file_path)
+            if not kwargs['force'] and LoadedFile.objects.filter(
+                name=file_path.name, checksum=checksum
+            ).exists():
+                self.stdout.write(self.style.NOTICE(
+                    f'Файл не изменился, загрузка пропущена: {file_path}'
+                ))
+                return
+            created, skipped, invalid = self.load(file_path, checksum)
+            if created:
+                invalidate_response_cache(['ingredients'])
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'Файл не найден: {file_path}'))
+            return
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Произошла ошибка: {e}'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Добавлено: {created}, уже существовало: {skipped}, '
+            f'некорректных строк: {invalid}'
+        ))
+
+    def get_checksum(self, file_path):
+        file_hash = hashlib.sha256()
+        with open(file_path, mode='rb') as file:
+            for chunk in iter(lambda: file.read(65536), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def read_rows(self, file):
+        if file.name.endswith('.json'):
+            for item in json.load(file):
+                yield [item.get('name'), item.get('measurement_unit')]
+        else:
+            yield from csv.reader(file)
+
+    def load(self, file_path, checksum):
+        existing_names = set(Ingredient.objects.values_list('name', flat=True))
+        created = skipped = invalid = 0
+        with open(file_path, mode='r', encoding='utf-8') as file, \
+                transaction.atomic():
+            rows = self.read_rows(file)
+            while True:
+                batch = list(islice(rows, BATCH_SIZE))
+                if not batch:
+                    break
+                ingredients = []
+                for row in batch:
+                    if len(row) != 2 or not all(row):
+                        invalid += 1
+                        continue
+                    name, measurement_unit = row
+                    if name in existing_names:
+                        skipped += 1
+                        continue
+                    existing_names.add(name)
+                    ingredients.append(Ingredient(
+                        name=name, measurement_unit=measurement_unit
+                    ))
+                Ingredient.objects.bulk_create(
+                    ingredients, ignore_conflicts=True
+                )
+                created += len(ingredients)
+            LoadedFile.objects.update_or_create(
+                name=file_path.name, defaults={'checksum': checksum}
+            )
+        return created, skipped, invalid
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+
+from api.utils import invalidate_shopping_lists
+from recipes.models import ShoppingListItem, User
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает или проверяет сохраненные списки покупок'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Только проверить расхождения, не изменяя данные'
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            action='append',
+            dest='user_ids',
+            help='ID пользователя (можно указать несколько раз)'
+        )
+
+    def handle(self, *args, **kwargs):
+        user_ids = kwargs['user_ids']
+        if not kwargs['verify']:
+            count = ShoppingListItem.objects.rebuild(user_ids)
+            if user_ids is None:
+                user_ids = User.objects.values_list('pk', flat=True)
+            invalidate_shopping_lists(user_ids)
+            self.stdout.write(self.style.SUCCESS(
+                f'Списки покупок пересобраны, позиций: {count}'
+            ))
+            return
+        expected = ShoppingListItem.objects.get_expected(user_ids)
+        stored_items = ShoppingListItem.objects.all()
+        if user_ids is not None:
+            stored_items = stored_items.filter(user_id__in=user_ids)
+        stored = {
+            (user_id, ingredient_id): total_amount
+            for user_id, ingredient_id, total_amount
+            in stored_items.values_list(
+                'user_id', 'ingredient_id', 'total_amount'
+            ).iterator()
+        }
+        mismatches = {
+            key for key in expected.keys() | stored.keys()
+            if expected.get(key) != stored.get(key)
+        }
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('Расхождений не найдено'))
+            return
+        for user_id, ingredient_id in sorted(mismatches):
+            self.stdout.write(self.style.WARNING(
+                f'Пользователь {user_id}, ингредиент {ingredient_id}: '
+                f'ожидалось {expected.get((user_id, ingredient_id), 0)}, '
+                f'сохранено {stored.get((user_id, ingredient_id), 0)}'
+            ))
+        self.stdout.write(self.style.ERROR(
+            f'Найдено расхождений: {len(mismatches)}'
+        ))
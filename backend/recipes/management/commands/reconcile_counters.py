@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from recipes.models import CartItem, FavoriteItem, Recipe
+from users.models import Subscription, User
+
+COUNTERS = (
+    (Recipe, 'favorites_count', FavoriteItem, 'recipe'),
+    (Recipe, 'cart_count', CartItem, 'recipe'),
+    (User, 'recipes_count', Recipe, 'author'),
+    (User, 'subscribers_count', Subscription, 'author'),
+)
+
+
+def count_related(model, field_name):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(
+                **{field_name: OuterRef('pk')}
+            ).order_by().values(field_name).annotate(
+                count=Count('pk')
+            ).values('count')
+        ),
+        0
+    )
+
+
+class Command(BaseCommand):
+    help = 'Проверяет и исправляет денормализованные счетчики'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Только проверить расхождения, не изменяя данные'
+        )
+
+    def handle(self, *args, **kwargs):
+        mismatches = 0
+        for model, field_name, related_model, related_field in COUNTERS:
+            actual = count_related(related_model, related_field)
+            drifted = list(
+                model.objects.annotate(actual=actual).exclude(
+                    **{field_name: F('actual')}
+                ).values_list('pk', field_name, 'actual')
+            )
+            for pk, stored, expected in drifted:
+                self.stdout.write(self.style.WARNING(
+                    f'{model._meta.verbose_name} {pk}, {field_name}: '
+                    f'ожидалось {expected}, сохранено {stored}'
+                ))
+            if drifted and not kwargs['verify']:
+                model.objects.filter(
+                    pk__in=[pk for pk, _, _ in drifted]
+                ).update(**{field_name: actual})
+            mismatches += len(drifted)
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('Расхождений не найдено'))
+        elif kwargs['verify']:
+            self.stdout.write(self.style.ERROR(
+                f'Найдено расхождений: {mismatches}'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Исправлено счетчиков: {mismatches}'
+            ))
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoadedFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Имя файла')),
+                ('checksum', models.CharField(max_length=64, verbose_name='Контрольная сумма')),
+                ('loaded_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Загруженный файл',
+                'verbose_name_plural': 'Загруженные файлы',
+            },
+        ),
+    ]
@@ -1,11 +1,14 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import (
     MaxValueValidator,
     MinValueValidator,
     RegexValidator,
 )
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Sum
 
-from users.models import User
+from users.models import CounterFieldsMixin, User
 
 
 class Tag(models.Model):
@@ -21,6 +24,7 @@ class Tag(models.Model):
             message='Введен некорекнтый логин.'
         ), ],
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Тег'
@@ -39,6 +43,7 @@ class Ingredient(models.Model):
         max_length=64,
         verbose_name='Единица измерения'
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Ингредиент'
@@ -48,7 +53,27 @@ class Ingredient(models.Model):
         return f'{self.name}-({self.measurement_unit})'
 
 
-class Recipe(models.Model):
+class LoadedFile(models.Model):
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Имя файла'
+    )
+    checksum = models.CharField(
+        max_length=64,
+        verbose_name='Контрольная сумма'
+    )
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Загруженный файл'
+        verbose_name_plural = 'Загруженные файлы'
+
+    def __str__(self):
+        return self.name
+
+
+class Recipe(CounterFieldsMixin, models.Model):
     tags = models.ManyToManyField(
         Tag,
         related_name='recipes',
@@ -84,15 +109,53 @@ class Recipe(models.Model):
         upload_to='media/recipes/',
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    favorites_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='В избранном'
+    )
+    cart_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='В корзине'
+    )
+
+    counter_fields = ('favorites_count', 'cart_count')
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='recipe_created_at_id_idx'
+            ),
+        ]
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.update_search_vector()
+
+    def update_search_vector(self):
+        if connections[self._state.db].vendor != 'postgresql':
+            return
+        Recipe.objects.filter(pk=self.pk).update(
+            search_vector=(
+                SearchVector(
+                    'name', weight='A', config=settings.SEARCH_CONFIG
+                )
+                + SearchVector(
+                    'text', weight='B', config=settings.SEARCH_CONFIG
+                )
+            )
+        )
+
 
 class IngredientInRecipe(models.Model):
     ingredient = models.ForeignKey(
@@ -114,6 +177,14 @@ class IngredientInRecipe(models.Model):
         ]
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['ingredient', 'recipe'],
+                name='ingredient_recipe_idx'
+            ),
+        ]
+
 
 class AbstractItem(models.Model):
     user = models.ForeignKey(
@@ -135,6 +206,8 @@ class AbstractItem(models.Model):
 
 
 class CartItem(AbstractItem):
+    counter_field = 'cart_count'
+
     class Meta:
         verbose_name = 'Корзина'
         verbose_name_plural = 'Корзина'
@@ -144,9 +217,137 @@ class CartItem(AbstractItem):
 
 
 class FavoriteItem(AbstractItem):
+    counter_field = 'favorites_count'
+
     class Meta:
         verbose_name = 'Избранный товар'
         verbose_name_plural = 'Избранные товары'
 
     def __str__(self):
         return f'{self.user.username} - {self.recipe.name}'
+
+
+class ShoppingListItemManager(models.Manager):
+    def apply_amounts(self, user_ids, amounts):
+        user_ids = list(user_ids)
+        amounts = {
+            ingredient_id: amount
+            for ingredient_id, amount in amounts.items()
+            if amount
+        }
+        if not user_ids or not amounts:
+            return
+        with transaction.atomic():
+            items = {
+                (item.user_id, item.ingredient_id): item
+                for item in self.select_for_update().filter(
+                    user_id__in=user_ids, ingredient_id__in=amounts
+                )
+            }
+            to_create, to_update, to_delete = [], [], []
+            for user_id in user_ids:
+                for ingredient_id, amount in amounts.items():
+                    item = items.get((user_id, ingredient_id))
+                    if item is None:
+                        if amount > 0:
+                            to_create.append(self.model(
+                                user_id=user_id,
+                                ingredient_id=ingredient_id,
+                                total_amount=amount
+                            ))
+                        continue
+                    item.total_amount += amount
+                    if item.total_amount > 0:
+                        to_update.append(item)
+                    else:
+                        to_delete.append(item.id)
+            self.bulk_create(to_create)
+            self.bulk_update(to_update, ['total_amount'])
+            self.filter(id__in=to_delete).delete()
+
+    def get_recipe_amounts(self, recipe_ids, sign=1):
+        return {
+            ingredient_id: sign * amount
+            for ingredient_id, amount in IngredientInRecipe.objects.filter(
+                recipe_id__in=recipe_ids
+            ).values_list('ingredient_id').annotate(
+                amount=Sum('amount')
+            ).order_by()
+        }
+
+    def add_recipes(self, user_ids, recipe_ids):
+        self.apply_amounts(user_ids, self.get_recipe_amounts(recipe_ids))
+
+    def remove_recipes(self, user_ids, recipe_ids):
+        self.apply_amounts(user_ids, self.get_recipe_amounts(recipe_ids, -1))
+
+    def get_expected(self, user_ids=None):
+        cart_items = CartItem.objects.all()
+        if user_ids is not None:
+            cart_items = cart_items.filter(user_id__in=user_ids)
+        return {
+            (user_id, ingredient_id): total_amount
+            for user_id, ingredient_id, total_amount in cart_items.values_list(
+                'user_id', 'recipe__ingredient_recipe__ingredient_id'
+            ).annotate(
+                total_amount=Sum('recipe__ingredient_recipe__amount')
+            ).order_by().iterator()
+            if ingredient_id is not None
+        }
+
+    def rebuild(self, user_ids=None):
+        with transaction.atomic():
+            users = User.objects.select_for_update()
+            stored = self.all()
+            if user_ids is not None:
+                users = users.filter(pk__in=user_ids)
+                stored = stored.filter(user_id__in=user_ids)
+            list(users.values_list('pk', flat=True))
+            expected = self.get_expected(user_ids)
+            stored.delete()
+            self.bulk_create(
+                [
+                    self.model(
+                        user_id=user_id,
+                        ingredient_id=ingredient_id,
+                        total_amount=total_amount
+                    )
+                    for (user_id, ingredient_id), total_amount
+                    in expected.items()
+                ],
+                batch_size=1000
+            )
+        return len(expected)
+
+
+class ShoppingListItem(models.Model):
+    user = models.ForeignKey(
+        User,
+        related_name='shopping_list',
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь'
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        related_name='shopping_list_items',
+        on_delete=models.CASCADE,
+        verbose_name='Ингредиент'
+    )
+    total_amount = models.PositiveIntegerField(
+        verbose_name='Общее количество'
+    )
+
+    objects = ShoppingListItemManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'ingredient'],
+                name='unique_shopping_list_item'
+            )
+        ]
+        verbose_name = 'Позиция списка покупок'
+        verbose_name_plural = 'Список покупок'
+
+    def __str__(self):
+        return f'{self.user} - {self.ingredient}: {self.total_amount}'
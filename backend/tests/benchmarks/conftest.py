@@ -0,0 +1,48 @@
+from time import perf_counter
+
+import pytest
+
+from recipes.models import Ingredient, IngredientInRecipe, Recipe, Tag
+
+BENCHMARK_RECIPES_COUNT = 60
+
+
+@pytest.fixture
+def benchmark_recipes(authors):
+    tags = [
+        Tag.objects.create(name=f'Тег {index}', slug=f'bench{index}')
+        for index in range(6)
+    ]
+    Ingredient.objects.bulk_create(
+        Ingredient(name=f'Продукт {index}', measurement_unit='г')
+        for index in range(200)
+    )
+    ingredients = list(Ingredient.objects.order_by('id'))
+    recipes = []
+    for index in range(BENCHMARK_RECIPES_COUNT):
+        recipe = Recipe.objects.create(
+            author=authors[index % len(authors)],
+            name=f'Рецепт {index}',
+            text='Описание ' * 40,
+            cooking_time=index + 1,
+            image='media/recipes/image.png',
+        )
+        recipe.tags.set(tags[index % 3:index % 3 + 3])
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(
+                recipe=recipe,
+                ingredient=ingredients[(index * 7 + position) % 200],
+                amount=position + 1,
+            )
+            for position in range(8)
+        )
+        recipes.append(recipe)
+    return recipes
+
+
+def measure(function, repeat):
+    function()
+    started = perf_counter()
+    for _ in range(repeat):
+        function()
+    return (perf_counter() - started) / repeat
@@ -0,0 +1,22 @@
+import pytest
+
+from .conftest import BENCHMARK_RECIPES_COUNT, measure
+
+REPEAT = 30
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_fast_serializer_throughput(settings, user_client, benchmark_recipes):
+    settings.RECIPE_CARD_CACHE = False
+    url = f'/api/recipes/?limit={BENCHMARK_RECIPES_COUNT}'
+    throughput = {}
+    for fast in (False, True):
+        settings.FAST_RECIPE_SERIALIZATION = fast
+        throughput[fast] = 1 / measure(lambda: user_client.get(url), REPEAT)
+    print(
+        f'\n{url}: ReadRecipeSerializer {throughput[False]:.1f} req/s, '
+        f'FastRecipeSerializer {throughput[True]:.1f} req/s per worker '
+        f'(x{throughput[True] / throughput[False]:.2f})'
+    )
+    assert throughput[True] > throughput[False]
@@ -0,0 +1,38 @@
+import tracemalloc
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+
+from .conftest import BENCHMARK_RECIPES_COUNT, measure
+
+REPEAT = 50
+
+
+def measure_peak(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize('limit', (10, BENCHMARK_RECIPES_COUNT))
+def test_renderer_time_and_allocation(user_client, benchmark_recipes, limit):
+    data = user_client.get(f'/api/recipes/?limit={limit}').data
+    results = {}
+    for renderer in (JSONRenderer(), FastJSONRenderer()):
+        results[type(renderer).__name__] = (
+            measure(lambda: renderer.render(data), REPEAT),
+            measure_peak(lambda: renderer.render(data)),
+        )
+    print(f'\n/api/recipes/?limit={limit}')
+    for name, (seconds, peak) in results.items():
+        print(f'{name}: {seconds * 1000:.3f} ms, peak {peak / 1024:.1f} KiB')
+    assert (
+        results['FastJSONRenderer'][0] < results['JSONRenderer'][0]
+    )
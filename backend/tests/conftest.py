@@ -0,0 +1,111 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from recipes.models import (
+    CartItem,
+    FavoriteItem,
+    Ingredient,
+    IngredientInRecipe,
+    Recipe,
+    Tag,
+)
+from users.models import Subscription, User
+
+RECIPES_COUNT = 8
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        email='user@foodgram.ru',
+        username='user',
+        first_name='Иван',
+        last_name='Иванов',
+        password='password-123',
+    )
+
+
+@pytest.fixture
+def authors(db):
+    return [
+        User.objects.create_user(
+            email=f'author{index}@foodgram.ru',
+            username=f'author{index}',
+            first_name='Пётр',
+            last_name='Петров',
+            password='password-123',
+        )
+        for index in range(4)
+    ]
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def user_client(user):
+    token = Token.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+@pytest.fixture
+def tags(db):
+    return [
+        Tag.objects.create(name=f'Тег {index}', slug=f'tag{index}')
+        for index in range(3)
+    ]
+
+
+@pytest.fixture
+def ingredients(db):
+    return [
+        Ingredient.objects.create(
+            name=f'Продукт {index}', measurement_unit='г'
+        )
+        for index in range(6)
+    ]
+
+
+@pytest.fixture
+def recipes(user, authors, tags, ingredients):
+    recipes = []
+    for index in range(RECIPES_COUNT):
+        recipe = Recipe.objects.create(
+            author=authors[index % len(authors)],
+            name=f'Рецепт {index}',
+            text='Описание',
+            cooking_time=index + 1,
+            image='media/recipes/image.png',
+        )
+        recipe.tags.set(tags[index % 2:index % 2 + 2])
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(
+                recipe=recipe,
+                ingredient=ingredient,
+                amount=index + position + 1,
+            )
+            for position, ingredient in enumerate(
+                ingredients[index % 3:index % 3 + 3]
+            )
+        )
+        recipes.append(recipe)
+    for recipe in recipes[::2]:
+        FavoriteItem.objects.create(user=user, recipe=recipe)
+    for recipe in recipes[::3]:
+        CartItem.objects.create(user=user, recipe=recipe)
+    for author in authors[:2]:
+        Subscription.objects.create(user=user, author=author)
+    return recipes
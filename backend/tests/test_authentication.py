@@ -0,0 +1,77 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from api.authentication import get_token_cache_key
+
+
+@pytest.mark.django_db
+def test_token_cache_keeps_no_secrets(user, user_client):
+    response = user_client.get('/api/users/me/')
+    assert response.status_code == 200
+    token = Token.objects.get(user=user)
+    cached = cache.get(get_token_cache_key(token.key))
+    assert cached is not None
+    assert user.password not in cached
+    assert token.key not in cached
+    response = user_client.get('/api/users/me/')
+    assert response.status_code == 200
+    assert response.json()['username'] == user.username
+
+
+@pytest.mark.django_db
+def test_cached_user_keeps_password(user, user_client):
+    user_client.get('/api/users/me/')
+    response = user_client.post(
+        '/api/users/set_password/',
+        {
+            'current_password': 'password-123',
+            'new_password': 'new-password-456',
+        },
+    )
+    assert response.status_code == 204, response.content
+    user.refresh_from_db()
+    assert user.check_password('new-password-456')
+
+
+@pytest.mark.django_db
+def test_inactive_user_is_rejected(
+    user, user_client, django_capture_on_commit_callbacks
+):
+    user_client.get('/api/users/me/')
+    user.is_active = False
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save()
+    assert user_client.get('/api/users/me/').status_code == 401
+
+
+@pytest.mark.django_db
+def test_logout_invalidates_cached_token(
+    user_client, django_capture_on_commit_callbacks
+):
+    assert user_client.get('/api/users/me/').status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        response = user_client.post('/api/auth/token/logout/')
+    assert response.status_code == 204
+    assert user_client.get('/api/users/me/').status_code == 401
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', ('/api/users/me/', '/api/recipes/'))
+def test_warm_token_cache_saves_a_query(user, user_client, recipes, url):
+    token_key = get_token_cache_key(Token.objects.get(user=user).key)
+    cache.clear()
+    with CaptureQueriesContext(connection) as cold:
+        assert user_client.get(url).status_code == 200
+    cached = cache.get(token_key)
+    cache.clear()
+    cache.set(token_key, cached)
+    with CaptureQueriesContext(connection) as warm:
+        assert user_client.get(url).status_code == 200
+    token_table = Token._meta.db_table
+    assert len(warm) == len(cold) - 1
+    assert not any(
+        token_table in query['sql'] for query in warm.captured_queries
+    )
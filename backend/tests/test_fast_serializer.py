@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from django.core.cache import cache
+
+URLS = (
+    '/api/recipes/',
+    '/api/recipes/?limit=3&page=2',
+    '/api/recipes/?tags=tag1',
+    '/api/recipes/?cursor=&limit=3',
+    '/api/recipes/?ids={third},{first}',
+    '/api/recipes/?is_favorited=1',
+    '/api/recipes/{first}/',
+)
+
+
+def get_content(client, settings, url, fast, cards):
+    settings.FAST_RECIPE_SERIALIZATION = fast
+    settings.RECIPE_CARD_CACHE = cards
+    cache.clear()
+    response = client.get(url)
+    assert response.status_code == 200, response.content
+    return response.content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('cards', (True, False))
+@pytest.mark.parametrize('client_name', ('client', 'user_client'))
+@pytest.mark.parametrize('url', URLS)
+def test_fast_serializer_matches_read_serializer(
+    request, settings, recipes, url, client_name, cards
+):
+    client = request.getfixturevalue(client_name)
+    url = url.format(first=recipes[0].id, third=recipes[2].id)
+    expected = get_content(client, settings, url, False, cards)
+    assert get_content(client, settings, url, True, cards) == expected
+    data = json.loads(expected)
+    next_url = isinstance(data, dict) and data.get('next')
+    if next_url:
+        assert get_content(
+            client, settings, next_url, True, cards
+        ) == get_content(client, settings, next_url, False, cards)
@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('query', (
+    {'ids': '1.5'},
+    {'ids': 'a'},
+    {'ingredients': '1.5'},
+    {'ingredients': '1', 'min_ingredients': '1.5'},
+))
+def test_recipe_id_filters_reject_non_integers(client, recipes, query):
+    response = client.get('/api/recipes/', query)
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_recipe_ids_filter_keeps_requested_order(client, recipes):
+    recipe_ids = [recipes[2].id, recipes[0].id]
+    response = client.get(
+        '/api/recipes/', {'ids': ','.join(map(str, recipe_ids))}
+    )
+    assert response.status_code == 200
+    assert [recipe['id'] for recipe in response.json()] == recipe_ids
+
+
+@pytest.mark.django_db
+def test_empty_recipe_ids_keep_pagination(client, recipes):
+    response = client.get('/api/recipes/', {'ids': '', 'limit': 2})
+    assert response.status_code == 200
+    assert len(response.json()['results']) == 2
+
+
+@pytest.mark.django_db
+def test_too_many_recipe_ids_are_rejected(client, settings, recipes):
+    settings.BULK_RECIPES_LIMIT = 2
+    recipe_ids = ','.join(str(recipe.id) for recipe in recipes[:3])
+    response = client.get('/api/recipes/', {'ids': recipe_ids})
+    assert response.status_code == 400
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_ingredient_detail_accepts_search(client, ingredients):
+    ingredient = ingredients[0]
+    response = client.get(
+        f'/api/ingredients/{ingredient.id}/', {'search': 'Продукт'}
+    )
+    assert response.status_code == 200
+    assert response.json()['id'] == ingredient.id
+
+
+@pytest.mark.django_db
+def test_ingredient_search_is_limited(client, settings, ingredients):
+    settings.SEARCH_RESULTS_LIMIT = 2
+    response = client.get('/api/ingredients/', {'search': 'Продукт'})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
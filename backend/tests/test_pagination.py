@@ -0,0 +1,38 @@
+import pytest
+
+from api.pagination import FastCountPagination
+
+from .conftest import RECIPES_COUNT
+
+
+@pytest.fixture(params=(2, 100))
+def estimate(request, monkeypatch):
+    monkeypatch.setattr(FastCountPagination, 'count_strategy', 'estimate')
+    monkeypatch.setattr(
+        FastCountPagination,
+        'get_planner_estimate',
+        lambda self, queryset: request.param
+    )
+    return request.param
+
+
+@pytest.mark.django_db
+def test_estimated_count_does_not_decide_valid_pages(
+    client, recipes, estimate
+):
+    ids = []
+    url = '/api/recipes/?limit=3'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+        data = response.json()
+        ids.extend(recipe['id'] for recipe in data['results'])
+        url = data['next']
+    assert len(ids) == len(set(ids)) == RECIPES_COUNT
+    assert data['count'] == RECIPES_COUNT
+
+
+@pytest.mark.django_db
+def test_pages_past_the_end_are_not_found(client, recipes, estimate):
+    response = client.get('/api/recipes/', {'limit': 3, 'page': 4})
+    assert response.status_code == 404
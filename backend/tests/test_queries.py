@@ -0,0 +1,38 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .conftest import RECIPES_COUNT
+
+
+def count_queries(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, response.content
+    return len(context)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast', (True, False))
+@pytest.mark.parametrize('cards', (True, False))
+@pytest.mark.parametrize('client_name', ('client', 'user_client'))
+def test_recipe_list_queries_do_not_depend_on_limit(
+    request, settings, recipes, fast, cards, client_name
+):
+    settings.FAST_RECIPE_SERIALIZATION = fast
+    settings.RECIPE_CARD_CACHE = cards
+    client = request.getfixturevalue(client_name)
+    assert count_queries(client, '/api/recipes/?limit=2') == count_queries(
+        client, f'/api/recipes/?limit={RECIPES_COUNT}'
+    )
+
+
+@pytest.mark.django_db
+def test_subscriptions_queries_do_not_depend_on_limit(user_client, recipes):
+    assert count_queries(
+        user_client, '/api/users/subscriptions/?limit=1&recipes_limit=1'
+    ) == count_queries(
+        user_client, '/api/users/subscriptions/?limit=2&recipes_limit=3'
+    )
@@ -0,0 +1,48 @@
+import pytest
+
+from recipes.models import IngredientInRecipe
+
+
+@pytest.fixture(autouse=True)
+def card_cache(settings):
+    settings.RECIPE_CARD_CACHE = True
+
+
+def get_recipe(client, recipe):
+    response = client.get(f'/api/recipes/{recipe.id}/')
+    assert response.status_code == 200, response.content
+    return response
+
+
+@pytest.mark.django_db
+def test_tag_changes_refresh_recipe_card(
+    client, recipes, tags, django_capture_on_commit_callbacks
+):
+    recipe = recipes[0]
+    etag = get_recipe(client, recipe)['ETag']
+    with django_capture_on_commit_callbacks(execute=True):
+        recipe.tags.add(tags[2])
+    response = get_recipe(client, recipe)
+    assert response['ETag'] != etag
+    assert tags[2].id in [tag['id'] for tag in response.json()['tags']]
+    with django_capture_on_commit_callbacks(execute=True):
+        tags[2].recipes.clear()
+    response = get_recipe(client, recipe)
+    assert tags[2].id not in [tag['id'] for tag in response.json()['tags']]
+
+
+@pytest.mark.django_db
+def test_ingredient_changes_refresh_recipe_card(
+    client, recipes, django_capture_on_commit_callbacks
+):
+    recipe = recipes[0]
+    etag = get_recipe(client, recipe)['ETag']
+    item = IngredientInRecipe.objects.filter(recipe=recipe).first()
+    item.amount += 10
+    with django_capture_on_commit_callbacks(execute=True):
+        item.save()
+    response = get_recipe(client, recipe)
+    assert response['ETag'] != etag
+    assert item.amount in [
+        ingredient['amount'] for ingredient in response.json()['ingredients']
+    ]
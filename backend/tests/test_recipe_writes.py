@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Ingredient
+
+IMAGE = (
+    'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAA'
+    'DUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=='
+)
+
+
+def get_payload(ingredients, tags, amount):
+    return {
+        'ingredients': [
+            {'id': ingredient.id, 'amount': amount}
+            for ingredient in ingredients
+        ],
+        'tags': [tag.id for tag in tags],
+        'image': IMAGE,
+        'name': 'Суп',
+        'text': 'Описание',
+        'cooking_time': 5,
+    }
+
+
+def is_catalogue_scan(sql):
+    table = connection.ops.quote_name(Ingredient._meta.db_table)
+    return sql.startswith('SELECT') and (
+        f'FROM {table}' in sql and 'WHERE' not in sql
+    )
+
+
+def count_write_queries(client, ingredients, tags):
+    cache.clear()
+    with CaptureQueriesContext(connection) as create_context:
+        response = client.post(
+            '/api/recipes/',
+            get_payload(ingredients[:3], tags[:2], 5),
+            format='json',
+        )
+    assert response.status_code == 201, response.content
+    cache.clear()
+    with CaptureQueriesContext(connection) as update_context:
+        response = client.patch(
+            f'/api/recipes/{response.json()["id"]}/',
+            get_payload(ingredients[1:4], tags[1:], 7),
+            format='json',
+        )
+    assert response.status_code == 200, response.content
+    for query in create_context.captured_queries + (
+        update_context.captured_queries
+    ):
+        assert not is_catalogue_scan(query['sql']), query['sql']
+    return len(create_context), len(update_context)
+
+
+@pytest.mark.django_db
+def test_recipe_write_queries_do_not_depend_on_catalogue_size(
+    settings, tmp_path, user_client, ingredients, tags
+):
+    settings.MEDIA_ROOT = tmp_path
+    small = count_write_queries(user_client, ingredients, tags)
+    Ingredient.objects.bulk_create(
+        Ingredient(name=f'Ингредиент {index}', measurement_unit='г')
+        for index in range(3000)
+    )
+    assert count_write_queries(user_client, ingredients, tags) == small
@@ -0,0 +1,74 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy as _
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+PAYLOADS = (
+    None,
+    [],
+    {'name': 'Суп', 'text': 'строка\u2028и\u2029абзац', 'amount': 5},
+    {'created_at': datetime.datetime(
+        2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    )},
+    {
+        'date': datetime.date(2024, 5, 1),
+        'time': datetime.time(12, 30),
+        'duration': datetime.timedelta(minutes=5),
+    },
+    {'price': Decimal('1.50'), 'id': uuid.UUID(int=1)},
+    {'detail': _('Invalid token.'), 'errors': [_('This field is required.')]},
+    {1: 'a', 'nested': {'big': 2 ** 70, 'items': (1, 2, 3)}},
+    {'hit_ratio': 0.125, 'flag': True, 'empty': None},
+    ReturnDict({'id': 1, 'tags': ReturnList([{'id': 1}], serializer=None)},
+               serializer=None),
+)
+
+
+@pytest.mark.parametrize('data', PAYLOADS)
+def test_fast_renderer_matches_json_renderer(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_fast_renderer_falls_back_for_indented_output():
+    data = {'id': 1, 'name': 'Суп'}
+    assert FastJSONRenderer().render(
+        data, 'application/json; indent=2'
+    ) == JSONRenderer().render(data, 'application/json; indent=2')
+
+
+@pytest.mark.parametrize('data', PAYLOADS[1:])
+def test_fast_parser_matches_json_parser(data):
+    content = JSONRenderer().render(data)
+    assert FastJSONParser().parse(io.BytesIO(content)) == JSONParser().parse(
+        io.BytesIO(content)
+    )
+
+
+@pytest.mark.django_db
+def test_fast_parser_reports_invalid_json(user_client):
+    response = user_client.post(
+        '/api/recipes/', '{"name": ', content_type='application/json'
+    )
+    assert response.status_code == 400
+    assert response.json()['detail'].startswith('JSON parse error')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('method, url, data', (
+    ('get', '/api/users/me/', None),
+    ('post', '/api/auth/token/login/', {'email': 'x'}),
+    ('post', '/api/recipes/', {}),
+))
+def test_error_bodies_match_json_renderer(client, user, method, url, data):
+    response = getattr(client, method)(url, data, format='json')
+    assert response.status_code in (400, 401)
+    assert response.content == JSONRenderer().render(response.data)
@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_response_cache_is_split_by_host(client, settings, recipes):
+    settings.ALLOWED_HOSTS = ['internal', 'foodgram.example.com']
+    client.get('/api/recipes/', HTTP_HOST='internal:8080')
+    response = client.get('/api/recipes/', HTTP_HOST='foodgram.example.com')
+    assert response.status_code == 200
+    assert response['X-Cache'] == 'MISS'
+    image = response.json()['results'][0]['image']
+    assert image.startswith('http://foodgram.example.com/')
+    response = client.get('/api/recipes/', HTTP_HOST='foodgram.example.com')
+    assert response['X-Cache'] == 'HIT'
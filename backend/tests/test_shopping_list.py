@@ -0,0 +1,157 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from rest_framework.test import APIClient
+
+from recipes.models import (
+    CartItem,
+    IngredientInRecipe,
+    Recipe,
+    ShoppingListItem,
+)
+
+
+def get_stored():
+    return {
+        (user_id, ingredient_id): total_amount
+        for user_id, ingredient_id, total_amount
+        in ShoppingListItem.objects.values_list(
+            'user_id', 'ingredient_id', 'total_amount'
+        )
+    }
+
+
+@pytest.fixture
+def carts(user, authors, recipes):
+    ShoppingListItem.objects.rebuild()
+    for recipe in recipes[:3]:
+        CartItem.objects.get_or_create(user=authors[0], recipe=recipe)
+    ShoppingListItem.objects.rebuild()
+    return recipes
+
+
+@pytest.mark.django_db
+def test_recipe_delete_updates_shopping_lists(carts):
+    carts[0].delete()
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+
+
+@pytest.mark.django_db
+def test_rolled_back_recipe_delete_keeps_signals_working(carts):
+    def fail(**kwargs):
+        raise RuntimeError
+
+    recipe_id = carts[0].id
+    pre_delete.connect(fail, sender=Recipe)
+    try:
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                carts[0].delete()
+    finally:
+        pre_delete.disconnect(fail, sender=Recipe)
+    item = IngredientInRecipe.objects.filter(recipe_id=recipe_id).first()
+    item.delete()
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+
+
+@pytest.mark.django_db
+def test_recipe_ingredient_changes_update_shopping_lists(
+    carts, ingredients
+):
+    item = IngredientInRecipe.objects.filter(recipe=carts[0]).first()
+    item.amount += 10
+    item.save()
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+    item.ingredient = ingredients[-1]
+    item.save()
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+    IngredientInRecipe.objects.create(
+        recipe=carts[0], ingredient=ingredients[-2], amount=7
+    )
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+    item.delete()
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+
+
+@pytest.mark.django_db
+def test_recipe_update_updates_shopping_lists(carts, ingredients, tags):
+    recipe = carts[0]
+    client = APIClient()
+    client.force_authenticate(recipe.author)
+    response = client.patch(
+        f'/api/recipes/{recipe.id}/',
+        {
+            'ingredients': [
+                {'id': ingredients[0].id, 'amount': 3},
+                {'id': ingredients[5].id, 'amount': 4},
+            ],
+            'tags': [tags[0].id],
+            'name': recipe.name,
+            'text': recipe.text,
+            'cooking_time': recipe.cooking_time,
+        },
+        format='json',
+    )
+    assert response.status_code == 200, response.content
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+
+
+@pytest.mark.django_db
+def test_bulk_cart_changes_apply_only_actual_changes(
+    user, user_client, carts
+):
+    recipe_ids = [recipe.id for recipe in carts[:4]]
+    in_cart = set(
+        CartItem.objects.filter(
+            user=user, recipe_id__in=recipe_ids
+        ).values_list('recipe_id', flat=True)
+    )
+    response = user_client.post(
+        '/api/recipes/shopping_cart/bulk/',
+        {'recipes': recipe_ids + [10 ** 6]},
+        format='json',
+    )
+    assert response.status_code == 200, response.content
+    assert [item['status'] for item in response.json()['results']] == [
+        'exists' if recipe_id in in_cart else 'added'
+        for recipe_id in recipe_ids
+    ] + ['not_found']
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+    response = user_client.delete(
+        '/api/recipes/shopping_cart/bulk/',
+        {'recipes': recipe_ids},
+        format='json',
+    )
+    assert response.status_code == 200, response.content
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+    for recipe in carts[:4]:
+        recipe.refresh_from_db()
+        assert recipe.cart_count == CartItem.objects.filter(
+            recipe=recipe
+        ).count()
+
+
+def download(client):
+    return b''.join(
+        client.get('/api/recipes/download_shopping_cart/').streaming_content
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_refreshes_cached_downloads(
+    user, user_client, carts, django_capture_on_commit_callbacks
+):
+    expected = download(user_client)
+    ShoppingListItem.objects.filter(
+        pk=ShoppingListItem.objects.filter(user=user).first().pk
+    ).update(total_amount=1000)
+    cache.clear()
+    assert download(user_client) != expected
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('rebuild_shopping_lists', stdout=StringIO())
+    assert get_stored() == ShoppingListItem.objects.get_expected()
+    assert download(user_client) == expected
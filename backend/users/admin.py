@@ -11,7 +11,9 @@ class UserAdmin(BaseUserAdmin):
         'email',
         'first_name',
         'last_name',
-        'avatar'
+        'avatar',
+        'recipes_count',
+        'subscribers_count',
     )
     list_display_links = (
         'username',